@@ -0,0 +1,33 @@
+# analysis.py
+from extract_general import extract_general_capabilities
+from extract_periods import extract_period_timeline
+from extract_video import extract_video_capabilities
+from extract_ladder import extract_ladder_capabilities
+from extract_audio import extract_audio_capabilities
+from extract_subtitles import extract_subtitle_capabilities
+from extract_drm import extract_drm_capabilities
+from profiler import profiled_extractor
+
+# Capability extractors in report order; each takes (root, ns) and returns
+# a list of (category, criteria, value) rows
+EXTRACTORS = [
+    extract_general_capabilities,
+    extract_video_capabilities,
+    extract_ladder_capabilities,
+    extract_audio_capabilities,
+    extract_subtitle_capabilities,
+    extract_drm_capabilities,
+]
+
+
+# Runs every extractor and the period timeline against a parsed MPD
+# When a profiler.Profiler is given, each call is recorded as its own stage
+# Returns (rows, timeline) ready for formatter.format_table / format_period_timeline
+def analyse_mpd(root, ns, profiler=None):
+    rows = []
+    for extractor in EXTRACTORS:
+        rows.extend(profiled_extractor(profiler, extractor, root, ns))
+
+    timeline = profiled_extractor(profiler, extract_period_timeline, root, ns)
+
+    return rows, timeline
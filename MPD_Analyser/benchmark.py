@@ -0,0 +1,174 @@
+# benchmark.py
+import io
+import time
+import tracemalloc
+
+from mpd_parser import load_mpd
+from mpd_generator import generate_mpd
+from analysis import EXTRACTORS
+from extract_periods import extract_period_timeline
+from formatter import format_table
+
+
+# Synthetic MPD shapes to benchmark, from a typical VOD title up to a very large manifest
+# Each entry is passed straight to mpd_generator.generate_mpd
+SCALES = [
+    {"periods": 1, "adaptation_sets_per_period": 3, "representations": 6,
+     "protection_density": 1.0, "timeline_length": 50},
+    {"periods": 10, "adaptation_sets_per_period": 6, "representations": 8,
+     "protection_density": 1.0, "timeline_length": 200},
+    {"periods": 50, "adaptation_sets_per_period": 12, "representations": 8,
+     "protection_density": 0.5, "timeline_length": 500},
+    {"periods": 100, "adaptation_sets_per_period": 12, "representations": 8,
+     "protection_density": 0.5, "timeline_length": 1000},
+]
+
+# Number of timed runs per stage; the fastest run is reported to reduce noise
+REPEAT = 3
+
+# Input each stage scales with, used to normalise its wall time (see input_sizes)
+# load_mpd and the extractors walk the whole tree ("//" searches), so they scale with the
+# element count; extract_period_timeline only visits Periods; format_table only sees rows
+STAGE_INPUTS = {
+    "extract_period_timeline": "periods",
+    "format_table": "rows",
+}
+DEFAULT_STAGE_INPUT = "elements"
+
+# A stage is flagged as super-linear when its wall time grows by more than this factor
+# times the growth of its input between two consecutive scales
+SUPERLINEAR_TOLERANCE = 1.5
+
+# Stages faster than this (seconds) at the smaller scale are too noisy to compare
+MIN_COMPARABLE_WALL = 50e-6
+
+# Stages timed individually after load_mpd (name, function taking (root, ns))
+STAGES = [(extractor.__name__, extractor) for extractor in EXTRACTORS]
+STAGES.append(("extract_period_timeline", extract_period_timeline))
+
+
+# Runs func(*args) REPEAT times for wall time, then once more under tracemalloc for peak memory
+# Timing and memory are measured in separate runs because tracemalloc slows execution down
+# Returns (result, best wall time in seconds, peak memory in bytes)
+def measure(func, *args):
+    best = None
+    result = None
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        result = func(*args)
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+
+    tracemalloc.start()
+    try:
+        func(*args)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return result, best, peak
+
+
+# Benchmarks every stage of the analyser against one synthetic MPD
+# Returns a list of (stage name, wall time in seconds, peak memory in bytes)
+def benchmark_scale(scale):
+    data = generate_mpd(**scale)
+    results = []
+
+    # load_mpd accepts file objects as well as paths, so the MPD is parsed from memory
+    (root, ns), wall, peak = measure(lambda: load_mpd(io.BytesIO(data)))
+    results.append(("load_mpd", wall, peak))
+
+    rows = []
+    for name, func in STAGES:
+        result, wall, peak = measure(func, root, ns)
+        results.append((name, wall, peak))
+        if name != "extract_period_timeline":
+            rows.extend(result)
+
+    _, wall, peak = measure(format_table, rows)
+    results.append(("format_table", wall, peak))
+
+    sizes = input_sizes(scale, sum(1 for _ in root.iter()), len(rows))
+    return len(data), sizes, results
+
+
+# Counts of every input dimension of a scale; stages can grow with any of them
+def input_sizes(scale, element_count, row_count):
+    sets = scale["periods"] * scale["adaptation_sets_per_period"]
+    return {
+        "elements": element_count,
+        "rows": row_count,
+        "periods": scale["periods"],
+        "AdaptationSets": sets,
+        "Representations": sets * scale["representations"],
+        "timeline <S>": sets * scale["timeline_length"],
+    }
+
+
+# Formats the results of one scale as a text block
+# "Per input" is the wall time divided by the input the stage scales with (STAGE_INPUTS)
+def format_results(scale, size, sizes, results):
+    lines = []
+    lines.append(
+        f"Scale: periods={scale['periods']}, sets/period={scale['adaptation_sets_per_period']}, "
+        f"reps={scale['representations']}, protection={scale['protection_density']}, "
+        f"timeline={scale['timeline_length']}"
+    )
+    lines.append(f"MPD size: {size / 1024:.1f} KiB, {sizes['elements']} elements")
+    lines.append(f"  {'Stage':<30} {'Wall (ms)':>10} {'Peak (KiB)':>11} {'Per input':>22}")
+
+    for name, wall, peak in results:
+        unit = STAGE_INPUTS.get(name, DEFAULT_STAGE_INPUT)
+        per_input = f"{wall * 1e6 / sizes[unit]:.3f} µs/{unit}"
+        lines.append(f"  {name:<30} {wall * 1000:>10.2f} {peak / 1024:>11.1f} {per_input:>22}")
+
+    lines.append("")
+    return "\n".join(lines)
+
+
+# Formats how each stage grew between two consecutive scales, next to how its input grew
+# A linear stage grows about as fast as its input (ratio ~1); a ratio clearly above 1 is
+# flagged. Growth of every input is listed too, in case a stage depends on another one.
+def format_scaling(previous, current):
+    prev_sizes, prev_results = previous
+    cur_sizes, cur_results = current
+
+    input_growth = {name: cur_sizes[name] / prev_sizes[name] for name in cur_sizes}
+
+    lines = ["Input growth: " + ", ".join(f"{name} ×{g:.1f}" for name, g in input_growth.items())]
+    lines.append(f"  {'Stage':<30} {'Time growth':>12} {'Input':>10} {'Input growth':>13} {'Ratio':>6}")
+
+    for (name, prev_wall, _), (_, cur_wall, _) in zip(prev_results, cur_results):
+        unit = STAGE_INPUTS.get(name, DEFAULT_STAGE_INPUT)
+        if prev_wall < MIN_COMPARABLE_WALL:
+            lines.append(f"  {name:<30} {'too fast':>12} {unit:>10}")
+            continue
+        growth = cur_wall / prev_wall
+        ratio = growth / input_growth[unit]
+        flag = "  SUPER-LINEAR?" if ratio > SUPERLINEAR_TOLERANCE else ""
+        lines.append(
+            f"  {name:<30} {'×' + format(growth, '.1f'):>12} {unit:>10} "
+            f"{'×' + format(input_growth[unit], '.1f'):>13} {ratio:>6.2f}{flag}"
+        )
+
+    lines.append("")
+    return "\n".join(lines)
+
+
+def main():
+    measured = []
+    for scale in SCALES:
+        size, sizes, results = benchmark_scale(scale)
+        print(format_results(scale, size, sizes, results))
+        measured.append((sizes, results))
+
+    print("===== SCALING =====")
+    print()
+    for previous, current in zip(measured, measured[1:]):
+        print(format_scaling(previous, current))
+
+
+if __name__ == "__main__":
+    main()
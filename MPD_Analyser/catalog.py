@@ -0,0 +1,651 @@
+# catalog.py
+import argparse
+import hashlib
+import sqlite3
+import sys
+from pathlib import Path
+import xml.etree.ElementTree as ET
+from datetime import datetime, timezone, timedelta
+
+from mpd_parser import load_mpd_bytes
+from analysis import analyse_mpd
+from extract_drm import DRM_UUID_MAP
+from extract_ladder import new_ladder_columns, analyse_ladder
+from formatter import format_table, format_period_timeline
+from utils import adaptation_set_content_type, codec_family, parse_frame_rate, positive_int
+from profiler import profiled, count_parsed_elements
+from fetcher import MAX_CONNECTIONS, iter_fetch, is_url
+
+# Default location of the SQLite catalog
+CATALOG_PATH = "mpd_catalog.sqlite"
+
+# Version of the analysis stored in the catalog
+# Bump it whenever an extractor or the normalized model changes: MPDs catalogued with
+# another version are treated as not catalogued and analysed again on their next ingest
+ANALYSER_VERSION = 1
+
+# Errors that mean one MPD could not be ingested: unreadable or unreachable (OSError),
+# malformed or truncated XML (ParseError) or a non-numeric attribute (ValueError)
+# Batch ingestion reports these and carries on with the next MPD
+INGEST_ERRORS = (OSError, ET.ParseError, ValueError)
+
+# Attribute name of cenc:default_KID on ContentProtection elements
+DEFAULT_KID_ATTR = "{urn:mpeg:cenc:2013}default_KID"
+
+# Catalog schema
+#   mpds                - one row per distinct MPD content (keyed by SHA-256 of the bytes)
+#                         and the ANALYSER_VERSION its rows were produced with
+#   sources             - file path / URL -> MPD it last resolved to
+#   periods             - period timeline (seconds) as produced by extract_period_timeline
+#   adaptation_sets     - normalized AdaptationSets
+#   representations     - normalized Representations (codec/resolution inherited from the set)
+#   content_protections - ContentProtection elements, on a set or on a single Representation
+#   report_rows         - capability rows produced by the extract_* functions
+#   fetch_validators    - ETag / Last-Modified of the last fetch of each URL source
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS mpds (
+    id              INTEGER PRIMARY KEY,
+    content_hash    TEXT NOT NULL UNIQUE,
+    mpd_type        TEXT,
+    profiles        TEXT,
+    ingested_at     TEXT NOT NULL,
+    analyser_version INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE TABLE IF NOT EXISTS sources (
+    source          TEXT PRIMARY KEY,
+    mpd_id          INTEGER NOT NULL REFERENCES mpds(id),
+    updated_at      TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS periods (
+    id              INTEGER PRIMARY KEY,
+    mpd_id          INTEGER NOT NULL REFERENCES mpds(id),
+    period_index    INTEGER NOT NULL,
+    period_id       TEXT,
+    start_seconds   REAL,
+    duration_seconds REAL,
+    end_seconds     REAL,
+    start_source    TEXT
+);
+
+CREATE TABLE IF NOT EXISTS adaptation_sets (
+    id              INTEGER PRIMARY KEY,
+    mpd_id          INTEGER NOT NULL REFERENCES mpds(id),
+    period_id       INTEGER NOT NULL REFERENCES periods(id),
+    set_index       INTEGER NOT NULL,
+    content_type    TEXT,
+    mime_type       TEXT,
+    lang            TEXT
+);
+
+CREATE TABLE IF NOT EXISTS representations (
+    id              INTEGER PRIMARY KEY,
+    mpd_id          INTEGER NOT NULL REFERENCES mpds(id),
+    adaptation_set_id INTEGER NOT NULL REFERENCES adaptation_sets(id),
+    rep_id          TEXT,
+    codecs          TEXT,
+    codec_family    TEXT,
+    bandwidth       INTEGER,
+    width           INTEGER,
+    height          INTEGER,
+    frame_rate      REAL
+);
+
+CREATE TABLE IF NOT EXISTS content_protections (
+    id              INTEGER PRIMARY KEY,
+    mpd_id          INTEGER NOT NULL REFERENCES mpds(id),
+    adaptation_set_id INTEGER NOT NULL REFERENCES adaptation_sets(id),
+    representation_id INTEGER REFERENCES representations(id),
+    scheme_id_uri   TEXT,
+    drm_system      TEXT,
+    default_kid     TEXT
+);
+
+CREATE TABLE IF NOT EXISTS report_rows (
+    mpd_id          INTEGER NOT NULL REFERENCES mpds(id),
+    position        INTEGER NOT NULL,
+    category        TEXT NOT NULL,
+    criteria        TEXT NOT NULL,
+    value           TEXT NOT NULL,
+    PRIMARY KEY (mpd_id, position)
+);
+
+CREATE TABLE IF NOT EXISTS fetch_validators (
+    url             TEXT PRIMARY KEY REFERENCES sources(source),
+    etag            TEXT,
+    last_modified   TEXT,
+    fetched_at      TEXT NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_periods_mpd ON periods(mpd_id, period_index);
+CREATE INDEX IF NOT EXISTS idx_sets_mpd ON adaptation_sets(mpd_id);
+CREATE INDEX IF NOT EXISTS idx_sets_lang ON adaptation_sets(lang, content_type);
+CREATE INDEX IF NOT EXISTS idx_reps_set ON representations(adaptation_set_id);
+DROP INDEX IF EXISTS idx_reps_codec;
+CREATE INDEX IF NOT EXISTS idx_reps_codec_nocase ON representations(codec_family COLLATE NOCASE, height);
+CREATE INDEX IF NOT EXISTS idx_reps_codecs ON representations(codecs);
+CREATE INDEX IF NOT EXISTS idx_reps_resolution ON representations(height, width);
+CREATE INDEX IF NOT EXISTS idx_cp_set ON content_protections(adaptation_set_id, drm_system);
+DROP INDEX IF EXISTS idx_cp_drm;
+CREATE INDEX IF NOT EXISTS idx_cp_drm_nocase ON content_protections(drm_system COLLATE NOCASE);
+"""
+
+
+# Opens (and creates if needed) the catalog at `path`
+def open_catalog(path=CATALOG_PATH):
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA foreign_keys = ON")
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.executescript(SCHEMA)
+
+    # Catalogs created before analyser_version existed get the column with version 0,
+    # so every MPD in them is re-analysed on its next ingest
+    columns = [row[1] for row in conn.execute("PRAGMA table_info(mpds)")]
+    if "analyser_version" not in columns:
+        with conn:
+            conn.execute(
+                "ALTER TABLE mpds ADD COLUMN analyser_version INTEGER NOT NULL DEFAULT 0"
+            )
+    return conn
+
+
+# Returns the SHA-256 hex digest used to key MPDs in the catalog
+def content_hash(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+# Current UTC time as an ISO 8601 string
+def _now():
+    return datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+
+# Converts an optional timedelta to seconds for storage
+def _seconds(td):
+    return td.total_seconds() if td is not None else None
+
+
+# Maps a ContentProtection schemeIdUri to a DRM system name (None for non-DRM schemes)
+def _drm_system(scheme):
+    scheme = (scheme or "").lower()
+    for uuid, name in DRM_UUID_MAP.items():
+        if uuid in scheme:
+            return name
+    return None
+
+
+# Finds ContentProtection children of an element (with and without namespace prefix)
+def _content_protections(element, ns):
+    return element.findall("dash:ContentProtection", ns) + element.findall("ContentProtection")
+
+
+# Inserts ContentProtection rows for one AdaptationSet or Representation
+def _insert_content_protections(conn, mpd_id, set_row_id, rep_row_id, element, ns):
+    conn.executemany(
+        "INSERT INTO content_protections "
+        "(mpd_id, adaptation_set_id, representation_id, scheme_id_uri, drm_system, default_kid) "
+        "VALUES (?, ?, ?, ?, ?, ?)",
+        [
+            (
+                mpd_id,
+                set_row_id,
+                rep_row_id,
+                cp.attrib.get("schemeIdUri"),
+                _drm_system(cp.attrib.get("schemeIdUri")),
+                cp.attrib.get(DEFAULT_KID_ATTR),
+            )
+            for cp in _content_protections(element, ns)
+        ],
+    )
+
+
+# Writes the normalized Period / AdaptationSet / Representation / ContentProtection model
+def _insert_model(conn, mpd_id, root, ns, timeline):
+    for period, entry in zip(root.findall("dash:Period", ns), timeline):
+        period_row_id = conn.execute(
+            "INSERT INTO periods "
+            "(mpd_id, period_index, period_id, start_seconds, duration_seconds, end_seconds, start_source) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (
+                mpd_id,
+                entry["index"],
+                period.attrib.get("id"),
+                _seconds(entry["start"]),
+                _seconds(entry["duration"]),
+                _seconds(entry["end"]),
+                entry["source"],
+            ),
+        ).lastrowid
+
+        for set_index, aset in enumerate(period.findall("dash:AdaptationSet", ns)):
+            set_attrs = aset.attrib
+
+            mime_type = set_attrs.get("mimeType")
+            content_type = adaptation_set_content_type(set_attrs)
+
+            set_row_id = conn.execute(
+                "INSERT INTO adaptation_sets "
+                "(mpd_id, period_id, set_index, content_type, mime_type, lang) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (mpd_id, period_row_id, set_index, content_type, mime_type, set_attrs.get("lang")),
+            ).lastrowid
+
+            _insert_content_protections(conn, mpd_id, set_row_id, None, aset, ns)
+
+            for rep in aset.findall("dash:Representation", ns):
+                attrs = rep.attrib
+                codecs = attrs.get("codecs") or set_attrs.get("codecs")
+                width = attrs.get("width") or set_attrs.get("width")
+                height = attrs.get("height") or set_attrs.get("height")
+                bandwidth = attrs.get("bandwidth")
+
+                rep_row_id = conn.execute(
+                    "INSERT INTO representations "
+                    "(mpd_id, adaptation_set_id, rep_id, codecs, codec_family, bandwidth, width, height, frame_rate) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        mpd_id,
+                        set_row_id,
+                        attrs.get("id"),
+                        codecs,
+                        codec_family(codecs) if codecs else None,
+                        int(bandwidth) if bandwidth else None,
+                        int(width) if width else None,
+                        int(height) if height else None,
+                        parse_frame_rate(attrs.get("frameRate") or set_attrs.get("frameRate")) or None,
+                    ),
+                ).lastrowid
+
+                _insert_content_protections(conn, mpd_id, set_row_id, rep_row_id, rep, ns)
+
+
+# Points `source` at `mpd_id`
+def _record_source(conn, source, mpd_id):
+    conn.execute(
+        "INSERT INTO sources (source, mpd_id, updated_at) VALUES (?, ?, ?) "
+        "ON CONFLICT(source) DO UPDATE SET mpd_id = excluded.mpd_id, updated_at = excluded.updated_at",
+        (source, mpd_id, _now()),
+    )
+
+
+# Returns (id, analyser version) of the MPD with the given content hash,
+# or (None, None) if it is not catalogued
+def find_mpd(conn, digest):
+    row = conn.execute(
+        "SELECT id, analyser_version FROM mpds WHERE content_hash = ?", (digest,)
+    ).fetchone()
+    return (row[0], row[1]) if row else (None, None)
+
+
+# Deletes the report rows and normalized model of an MPD (the mpds row is kept)
+def _delete_analysis(conn, mpd_id):
+    for table in ("content_protections", "representations", "adaptation_sets", "periods", "report_rows"):
+        conn.execute(f"DELETE FROM {table} WHERE mpd_id = ?", (mpd_id,))
+
+
+# Writes the report rows and normalized model of an analysed MPD; returns its id
+# An existing mpds row (stale version or forced re-ingest) keeps its id, so sources stay valid
+def _store_mpd(conn, digest, root, ns, rows, timeline, mpd_id=None):
+    values = (root.attrib.get("type", "static"), root.attrib.get("profiles"), _now(), ANALYSER_VERSION)
+
+    if mpd_id is None:
+        mpd_id = conn.execute(
+            "INSERT INTO mpds (content_hash, mpd_type, profiles, ingested_at, analyser_version) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (digest,) + values,
+        ).lastrowid
+    else:
+        _delete_analysis(conn, mpd_id)
+        conn.execute(
+            "UPDATE mpds SET mpd_type = ?, profiles = ?, ingested_at = ?, analyser_version = ? "
+            "WHERE id = ?",
+            values + (mpd_id,),
+        )
+
+    conn.executemany(
+        "INSERT INTO report_rows (mpd_id, position, category, criteria, value) VALUES (?, ?, ?, ?, ?)",
+        [(mpd_id, i, cat, crit, val) for i, (cat, crit, val) in enumerate(rows)],
+    )
+    _insert_model(conn, mpd_id, root, ns, timeline)
+    return mpd_id
+
+
+# Ingests MPD bytes read from `source` (a path or URL)
+# Ingestion is incremental: content already in the catalog (same SHA-256, analysed by the
+# current ANALYSER_VERSION) is not parsed again unless `reingest` is set
+# When a profiler.Profiler is given, parsing, each extractor and the catalog write are timed
+# Returns (mpd_id, True if the MPD was newly analysed)
+def ingest_mpd(conn, source, data, profiler=None, reingest=False):
+    digest = content_hash(data)
+
+    with conn:
+        mpd_id, version = find_mpd(conn, digest)
+        if mpd_id is not None and version == ANALYSER_VERSION and not reingest:
+            _record_source(conn, source, mpd_id)
+            return mpd_id, False
+
+        root, ns = profiled(
+            profiler, "load_mpd", load_mpd_bytes, data, count=count_parsed_elements
+        )
+        rows, timeline = analyse_mpd(root, ns, profiler)
+
+        mpd_id = profiled(
+            profiler, "catalog_write", _store_mpd, conn, digest, root, ns, rows, timeline, mpd_id,
+            repeatable=False,
+        )
+        _record_source(conn, source, mpd_id)
+
+    return mpd_id, True
+
+
+# Reads an MPD file from disk and ingests it
+def ingest_file(conn, path, profiler=None, reingest=False):
+    with open(path, "rb") as f:
+        return ingest_mpd(conn, str(path), f.read(), profiler, reingest)
+
+
+# Returns {url: {"etag": ..., "last_modified": ...}} for URLs already in the catalog
+# Only URLs whose MPD was analysed by the current ANALYSER_VERSION get validators, so a 304
+# always resolves to an up-to-date report and outdated analyses are downloaded again
+def get_validators(conn, urls):
+    validators = {}
+    for url in urls:
+        row = conn.execute(
+            "SELECT v.etag, v.last_modified FROM fetch_validators v "
+            "JOIN sources s ON s.source = v.url "
+            "JOIN mpds m ON m.id = s.mpd_id "
+            "WHERE v.url = ? AND m.analyser_version = ?",
+            (url, ANALYSER_VERSION),
+        ).fetchone()
+        if row:
+            validators[url] = {"etag": row[0], "last_modified": row[1]}
+    return validators
+
+
+# Saves the validators of a fetch so the next fetch of `url` can be conditional
+def _store_validators(conn, url, etag, last_modified):
+    with conn:
+        conn.execute(
+            "INSERT INTO fetch_validators (url, etag, last_modified, fetched_at) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT(url) DO UPDATE SET etag = excluded.etag, "
+            "last_modified = excluded.last_modified, fetched_at = excluded.fetched_at",
+            (url, etag, last_modified, _now()),
+        )
+
+
+# Ingests one fetcher.fetch_mpd result
+# A 304 Not Modified resolves to the MPD already catalogued for the URL without parsing
+# Returns (mpd_id, True if the MPD was newly analysed); raises OSError if the fetch failed
+# and, like ingest_mpd, one of INGEST_ERRORS if the body is not a valid MPD
+# With a profiler, the fetch (timed by the fetcher) is recorded as the "fetch" stage
+def ingest_fetched(conn, result, profiler=None, reingest=False):
+    url = result["url"]
+    if profiler:
+        profiler.record("fetch", result["elapsed"])
+    if result["error"]:
+        raise OSError(f"Could not fetch {url}: {result['error']}")
+
+    if result["not_modified"]:
+        mpd_id, new = resolve_mpd(conn, url), False
+    else:
+        mpd_id, new = ingest_mpd(conn, url, result["data"], profiler, reingest)
+
+    _store_validators(conn, url, result["etag"], result["last_modified"])
+    return mpd_id, new
+
+
+# Fetches URLs concurrently, sending conditional requests for URLs already catalogued
+# With `reingest`, requests are unconditional so every manifest is downloaded and re-analysed
+# Yields fetch results as they complete; ingest each with ingest_fetched before taking the
+# next one, so memory stays bounded by the fetches in flight rather than the corpus size
+def fetch_sources(conn, urls, max_connections=MAX_CONNECTIONS, reingest=False):
+    urls = list(dict.fromkeys(urls))
+    validators = {} if reingest else get_validators(conn, urls)
+    return iter_fetch(urls, validators, max_connections)
+
+
+# Rebuilds the capability rows and period timeline of a catalogued MPD
+# The result has the same shape as analysis.analyse_mpd, so the formatter can be reused
+def load_report(conn, mpd_id):
+    rows = conn.execute(
+        "SELECT category, criteria, value FROM report_rows WHERE mpd_id = ? ORDER BY position",
+        (mpd_id,),
+    ).fetchall()
+
+    def to_td(seconds):
+        return timedelta(seconds=seconds) if seconds is not None else None
+
+    timeline = [
+        {
+            "index": index,
+            "start": to_td(start),
+            "duration": to_td(duration),
+            "end": to_td(end),
+            "source": source,
+        }
+        for index, start, duration, end, source in conn.execute(
+            "SELECT period_index, start_seconds, duration_seconds, end_seconds, start_source "
+            "FROM periods WHERE mpd_id = ? ORDER BY period_index",
+            (mpd_id,),
+        )
+    ]
+
+    return rows, timeline
+
+
+# Renders the markdown table and period timeline text of a catalogued MPD
+def format_report(conn, mpd_id):
+    rows, timeline = load_report(conn, mpd_id)
+    return "\n".join([format_table(rows), format_period_timeline(timeline)])
+
+
+# Resolves a source (path / URL) or content hash prefix to an MPD id
+def resolve_mpd(conn, key):
+    row = conn.execute("SELECT mpd_id FROM sources WHERE source = ?", (key,)).fetchone()
+    if row:
+        return row[0]
+
+    matches = conn.execute(
+        "SELECT id FROM mpds WHERE content_hash LIKE ? || '%'", (key,)
+    ).fetchall()
+    if len(matches) == 1:
+        return matches[0][0]
+    return None
+
+
+# Lists sources whose Representations of the given codec family (and optionally height)
+# are not protected by `drm_system`, either on the AdaptationSet or the Representation
+# Codec family and DRM system names are matched case-insensitively ("hevc" finds "HEVC")
+# Returns (source, content hash, number of unprotected Representations) tuples
+def find_missing_drm(conn, drm_system, family=None, height=None):
+    conditions = []
+    params = [drm_system]
+    if family:
+        conditions.append("r.codec_family = ? COLLATE NOCASE")
+        params.append(family)
+    if height:
+        conditions.append("r.height = ?")
+        params.append(height)
+
+    where = (" AND " + " AND ".join(conditions)) if conditions else ""
+
+    return conn.execute(
+        "SELECT s.source, m.content_hash, COUNT(*) "
+        "FROM representations r "
+        "JOIN mpds m ON m.id = r.mpd_id "
+        "JOIN sources s ON s.mpd_id = m.id "
+        "WHERE NOT EXISTS ("
+        "  SELECT 1 FROM content_protections cp "
+        "  WHERE cp.adaptation_set_id = r.adaptation_set_id "
+        "    AND (cp.representation_id IS NULL OR cp.representation_id = r.id) "
+        "    AND cp.drm_system = ? COLLATE NOCASE"
+        ")" + where + " "
+        "GROUP BY s.source, m.content_hash ORDER BY s.source",
+        params,
+    ).fetchall()
+
+
+# Fills ladder columns (see extract_ladder) from the catalogued video Representations
+# of every MPD, without re-parsing any of them. mpd_id is the catalog MPD id and
+# set_index the catalog AdaptationSet id, so rungs group per AdaptationSet as in an MPD
+# Only MPDs that a source still points to are loaded: earlier versions of a changed file
+# or URL stay in the catalog but are no longer audited
+def load_ladder_columns(conn):
+    columns = new_ladder_columns()
+
+    for mpd_id, set_id, bandwidth, width, height, frame_rate, family in conn.execute(
+        "SELECT r.mpd_id, r.adaptation_set_id, r.bandwidth, r.width, r.height, "
+        "r.frame_rate, r.codec_family "
+        "FROM representations r JOIN adaptation_sets a ON a.id = r.adaptation_set_id "
+        "WHERE a.content_type = 'video' "
+        "AND EXISTS (SELECT 1 FROM sources s WHERE s.mpd_id = r.mpd_id) "
+        "ORDER BY r.mpd_id, r.adaptation_set_id"
+    ):
+        columns["mpd_id"].append(mpd_id)
+        columns["set_index"].append(set_id)
+        columns["bandwidth"].append(bandwidth or 0)
+        columns["width"].append(width or 0)
+        columns["height"].append(height or 0)
+        columns["frame_rate"].append(frame_rate or 0.0)
+        columns["codec_family"].append(family or "Unknown")
+
+    return columns
+
+
+# Runs the ladder analysis over the whole catalog in one pass
+# Returns one summary per MPD: (content hash, sources, ladders, duplicate rungs, inverted rungs)
+# where ladders maps codec family -> sorted distinct (width, height, bandwidth) rungs
+def catalog_ladder_summary(conn):
+    analysis = analyse_ladder(load_ladder_columns(conn))
+
+    issues = {}
+    for mpd_id, duplicate, inverted in zip(
+        analysis["mpd_id"], analysis["duplicate"], analysis["inverted"]
+    ):
+        counts = issues.setdefault(mpd_id, [0, 0])
+        counts[0] += duplicate
+        counts[1] += inverted
+
+    ladders = {}
+    for (mpd_id, family), rungs in analysis["ladders"].items():
+        ladders.setdefault(mpd_id, {})[family] = rungs
+
+    names = {
+        mpd_id: (digest, sources)
+        for mpd_id, digest, sources in conn.execute(
+            "SELECT m.id, m.content_hash, GROUP_CONCAT(s.source, ', ') "
+            "FROM mpds m JOIN sources s ON s.mpd_id = m.id GROUP BY m.id"
+        )
+    }
+
+    return [
+        (names[mpd_id][0], names[mpd_id][1], ladders[mpd_id], *issues[mpd_id])
+        for mpd_id in sorted(ladders)
+    ]
+
+
+# Command-line interface for ingesting into and querying the catalog
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Query the MPD catalog")
+    parser.add_argument("--catalog", default=CATALOG_PATH, help="SQLite catalog path")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    ingest = commands.add_parser("ingest", help="Ingest MPD files or URLs")
+    ingest.add_argument("paths", nargs="+")
+    ingest.add_argument("--max-connections", type=positive_int, default=MAX_CONNECTIONS,
+                        help="Concurrent HTTP connections for URLs")
+    ingest.add_argument("--reingest", action="store_true",
+                        help="Re-analyse MPDs even if they are already catalogued")
+
+    commands.add_parser("list", help="List catalogued sources")
+
+    report = commands.add_parser("report", help="Print the report of a catalogued MPD")
+    report.add_argument("mpd", help="Source path / URL or content hash prefix")
+
+    missing = commands.add_parser("missing-drm", help="Find titles lacking a DRM system")
+    missing.add_argument("--drm", required=True, help="DRM system, e.g. Widevine")
+    missing.add_argument("--codec", help="Codec family, e.g. HEVC")
+    missing.add_argument("--height", type=int, help="Rung height, e.g. 1080")
+
+    ladder = commands.add_parser("ladder", help="Bitrate-ladder QA across the whole catalog")
+    ladder.add_argument("--issues-only", action="store_true",
+                        help="Only list MPDs with duplicate or inverted rungs")
+
+    sql = commands.add_parser("sql", help="Run a read-only SQL query")
+    sql.add_argument("query")
+
+    args = parser.parse_args(argv)
+    conn = open_catalog(args.catalog)
+
+    if args.command == "ingest":
+        # Local files first, then URLs in the order their fetches complete
+        files = [p for p in args.paths if not is_url(p)]
+        urls = [p for p in args.paths if is_url(p)]
+
+        def ingest_all():
+            for path in files:
+                yield path, lambda path=path: ingest_file(conn, path, reingest=args.reingest)
+            for result in fetch_sources(conn, urls, args.max_connections, args.reingest):
+                yield result["url"], lambda result=result: ingest_fetched(
+                    conn, result, reingest=args.reingest
+                )
+
+        for path, ingest in ingest_all():
+            try:
+                mpd_id, new = ingest()
+            except INGEST_ERRORS as e:
+                print(f"Failed: {path}: {e}", file=sys.stderr)
+                continue
+            print(f"{'Ingested' if new else 'Unchanged'}: {path} (mpd {mpd_id})")
+
+    elif args.command == "list":
+        for source, digest, updated in conn.execute(
+            "SELECT s.source, m.content_hash, s.updated_at "
+            "FROM sources s JOIN mpds m ON m.id = s.mpd_id ORDER BY s.source"
+        ):
+            print(f"{digest[:12]}  {updated}  {source}")
+
+    elif args.command == "report":
+        mpd_id = resolve_mpd(conn, args.mpd)
+        if mpd_id is None:
+            print(f"Not in catalog: {args.mpd}", file=sys.stderr)
+            return 1
+        print(format_report(conn, mpd_id))
+
+    elif args.command == "missing-drm":
+        for source, digest, count in find_missing_drm(conn, args.drm, args.codec, args.height):
+            print(f"{digest[:12]}  {count:>4} rep(s)  {source}")
+
+    elif args.command == "ladder":
+        for digest, sources, ladders, duplicates, inverted in catalog_ladder_summary(conn):
+            if args.issues_only and not (duplicates or inverted):
+                continue
+            summary = "; ".join(
+                f"{family}: {len(rungs)} rungs {rungs[0][0]}×{rungs[0][1]} → {rungs[-1][0]}×{rungs[-1][1]}"
+                for family, rungs in sorted(ladders.items())
+            )
+            print(f"{digest[:12]}  dup={duplicates} inv={inverted}  {summary}  {sources}")
+
+    elif args.command == "sql":
+        # Run ad-hoc queries on a read-only connection so they cannot modify the catalog
+        # An in-memory catalog has no file to reopen, so its own connection is made read-only
+        if args.catalog == ":memory:":
+            ro = conn
+            ro.execute("PRAGMA query_only = ON")
+        else:
+            ro = sqlite3.connect(Path(args.catalog).resolve().as_uri() + "?mode=ro", uri=True)
+        try:
+            cursor = ro.execute(args.query)
+        except sqlite3.Error as e:
+            print(f"Query failed: {e}", file=sys.stderr)
+            return 1
+        if cursor.description:
+            print("\t".join(col[0] for col in cursor.description))
+        for row in cursor:
+            print("\t".join("" if v is None else str(v) for v in row))
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,5 +1,13 @@
 # extract_drm.py
 
+# Map of DRM system UUIDs to friendly names
+# These UUIDs are standardized identifiers for each DRM system
+DRM_UUID_MAP = {
+    "edef8ba9-79d6-4ace-a3c8-27dcd51d21ed": "Widevine",    # Google Widevine
+    "9a04f079-9840-4286-ab92-e65be0885f95": "PlayReady",   # Microsoft PlayReady
+    "94ce86fb-07ff-4f43-adb8-93d2fa968ca2": "FairPlay",    # Apple FairPlay
+}
+
 # Extracts DRM (Digital Rights Management) and encryption information from an MPD
 # Identifies DRM systems (Widevine, PlayReady, FairPlay) and encryption status
 def extract_drm_capabilities(root, ns):
@@ -25,14 +33,6 @@ def extract_drm_capabilities(root, ns):
     # Set to store unique DRM systems found
     drm_systems = set()
 
-    # Map of DRM system UUIDs to friendly names
-    # These UUIDs are standardized identifiers for each DRM system
-    DRM_UUID_MAP = {
-        "edef8ba9-79d6-4ace-a3c8-27dcd51d21ed": "Widevine",    # Google Widevine
-        "9a04f079-9840-4286-ab92-e65be0885f95": "PlayReady",   # Microsoft PlayReady
-        "94ce86fb-07ff-4f43-adb8-93d2fa968ca2": "FairPlay",    # Apple FairPlay
-    }
-
     # Check each ContentProtection element for known DRM system UUIDs
     for cp in content_protections:
         # Extract the schemeIdUri attribute (contains DRM system UUID)
@@ -0,0 +1,204 @@
+# extract_ladder.py
+from array import array
+from operator import eq, mul, lt, and_
+
+from utils import adaptation_set_content_type, codec_family, parse_frame_rate
+
+# Ladder data is held in columns (one typed array per field) rather than one object per
+# Representation. Every metric below is computed as a whole-column operation, so the same
+# code analyses one MPD or the concatenated ladders of thousands of MPDs in a single pass.
+
+
+# Creates an empty set of ladder columns
+#   mpd_id       - index of the MPD the rung belongs to (0 for single-MPD analysis)
+#   set_index    - index of the video AdaptationSet inside its MPD
+#   bandwidth    - bits per second
+#   width/height - pixels (0 when not signalled)
+#   frame_rate   - frames per second (0.0 when not signalled)
+#   codec_family - "AVC", "HEVC", ... (see utils.codec_family)
+def new_ladder_columns():
+    return {
+        "mpd_id": array("l"),
+        "set_index": array("l"),
+        "bandwidth": array("q"),
+        "width": array("l"),
+        "height": array("l"),
+        "frame_rate": array("d"),
+        "codec_family": [],
+    }
+
+
+# Appends every video Representation of an MPD to the given columns (or to new ones)
+# Video sets are picked with utils.adaptation_set_content_type, the same rule the catalog
+# stores, so per-MPD and catalog-wide ladders agree (mimeType-only sets are included)
+# Attributes missing on a Representation are inherited from its AdaptationSet
+def build_ladder_columns(root, ns, mpd_id=0, columns=None):
+    if columns is None:
+        columns = new_ladder_columns()
+
+    video_sets = [
+        aset for aset in root.findall(".//dash:AdaptationSet", ns)
+        if adaptation_set_content_type(aset.attrib) == "video"
+    ]
+
+    for set_index, aset in enumerate(video_sets):
+        set_attrs = aset.attrib
+
+        for rep in aset.findall("dash:Representation", ns):
+            attrs = rep.attrib
+            columns["mpd_id"].append(mpd_id)
+            columns["set_index"].append(set_index)
+            columns["bandwidth"].append(int(attrs.get("bandwidth", 0)))
+            columns["width"].append(int(attrs.get("width") or set_attrs.get("width") or 0))
+            columns["height"].append(int(attrs.get("height") or set_attrs.get("height") or 0))
+            columns["frame_rate"].append(
+                parse_frame_rate(attrs.get("frameRate") or set_attrs.get("frameRate"))
+            )
+            columns["codec_family"].append(
+                codec_family(attrs.get("codecs") or set_attrs.get("codecs"))
+            )
+
+    return columns
+
+
+# Builds one set of columns covering many MPDs; `mpds` is an iterable of (root, ns) pairs
+# The position of each MPD in the iterable becomes its mpd_id
+def build_catalog_ladder_columns(mpds):
+    columns = new_ladder_columns()
+    for mpd_id, (root, ns) in enumerate(mpds):
+        build_ladder_columns(root, ns, mpd_id, columns)
+    return columns
+
+
+# Reorders a column by a list of indices, keeping its array type
+def _take(column, order):
+    if isinstance(column, array):
+        return array(column.typecode, [column[i] for i in order])
+    return [column[i] for i in order]
+
+
+# Division that yields 0.0 instead of failing when the divisor is zero
+def _safe_div(a, b):
+    return a / b if b else 0.0
+
+
+# Analyses ladder columns and returns the sorted columns plus derived per-rung columns:
+#   pixels          - width × height
+#   bits_per_pixel  - bandwidth / (width × height × frame rate)
+#   step_ratio      - bandwidth / bandwidth of the previous rung in the same AdaptationSet
+#                     (0.0 for the lowest rung)
+#   duplicate       - 1 if the rung has the same bandwidth as the previous rung
+#   inverted        - 1 if the rung has fewer pixels than the lower-bandwidth rung before it
+# and "ladders": {(mpd_id, codec family): sorted distinct (width, height, bandwidth) rungs}
+def analyse_ladder(columns):
+    n = len(columns["bandwidth"])
+
+    # Sort rungs by MPD, AdaptationSet, bandwidth (and pixels to make ties deterministic)
+    mpd_ids = columns["mpd_id"]
+    set_indexes = columns["set_index"]
+    bandwidths = columns["bandwidth"]
+    raw_pixels = list(map(mul, columns["width"], columns["height"]))
+    order = sorted(
+        range(n),
+        key=lambda i: (mpd_ids[i], set_indexes[i], bandwidths[i], raw_pixels[i]),
+    )
+    cols = {name: _take(column, order) for name, column in columns.items()}
+
+    bandwidth = cols["bandwidth"]
+    pixels = array("q", map(mul, cols["width"], cols["height"]))
+    pixel_rate = array("d", map(mul, pixels, cols["frame_rate"]))
+    bits_per_pixel = array("d", map(_safe_div, bandwidth, pixel_rate))
+
+    # Compare every rung with the one before it: same_set[i] is 1 when rung i and i-1
+    # belong to the same AdaptationSet of the same MPD
+    same_set = array("b", [0]) + array("b", map(
+        and_,
+        map(eq, cols["mpd_id"][1:], cols["mpd_id"][:-1]),
+        map(eq, cols["set_index"][1:], cols["set_index"][:-1]),
+    )) if n else array("b")
+
+    previous_bandwidth = array("q", [0]) + bandwidth[:-1] if n else array("q")
+    previous_pixels = array("q", [0]) + pixels[:-1] if n else array("q")
+
+    step_ratio = array("d", map(
+        mul, same_set, map(_safe_div, bandwidth, previous_bandwidth)
+    ))
+    duplicate = array("b", map(and_, same_set, map(eq, bandwidth, previous_bandwidth)))
+    inverted = array("b", map(and_, same_set, map(lt, pixels, previous_pixels)))
+
+    # Per-codec ladders: distinct rungs per MPD and codec family, regardless of the period
+    # or AdaptationSet they were signalled in
+    ladders = {}
+    for key, rung in zip(
+        zip(cols["mpd_id"], cols["codec_family"]),
+        zip(cols["width"], cols["height"], bandwidth),
+    ):
+        ladders.setdefault(key, set()).add(rung)
+    ladders = {
+        key: sorted(rungs, key=lambda r: (r[2], r[0] * r[1]))
+        for key, rungs in ladders.items()
+    }
+
+    cols.update({
+        "pixels": pixels,
+        "bits_per_pixel": bits_per_pixel,
+        "step_ratio": step_ratio,
+        "duplicate": duplicate,
+        "inverted": inverted,
+        "ladders": ladders,
+    })
+    return cols
+
+
+# Extracts bitrate-ladder QA rows for one MPD
+# Reports per-codec ladders, bits-per-pixel range, rung step ratios, duplicate and inverted rungs
+def extract_ladder_capabilities(root, ns):
+    rows = []
+
+    analysis = analyse_ladder(build_ladder_columns(root, ns))
+
+    # No video Representations means there is no ladder to analyse
+    if not analysis["ladders"]:
+        rows.append(("Video Ladder", "Ladder Analysis", "No video Representations"))
+        return rows
+
+    # One row per codec family describing its distinct rungs
+    for (_, family), rungs in sorted(analysis["ladders"].items()):
+        low_w, low_h, low_bw = rungs[0]
+        high_w, high_h, high_bw = rungs[-1]
+        rows.append((
+            "Video Ladder",
+            f"{family} Ladder",
+            f"{len(rungs)} rungs, {low_w}×{low_h} @ {low_bw//1000} kbps "
+            f"→ {high_w}×{high_h} @ {high_bw//1000} kbps"
+        ))
+
+    # Bits per pixel is only meaningful where resolution and frame rate are signalled
+    bpp = [v for v in analysis["bits_per_pixel"] if v]
+    rows.append((
+        "Video Ladder",
+        "Bits per Pixel Range",
+        f"{min(bpp):.3f} – {max(bpp):.3f}" if bpp else "Not determinable"
+    ))
+
+    # Step ratios between consecutive rungs (lowest rung of each AdaptationSet has none)
+    steps = [v for v in analysis["step_ratio"] if v]
+    rows.append((
+        "Video Ladder",
+        "Rung Step Ratio Range",
+        f"{min(steps):.2f}× – {max(steps):.2f}×" if steps else "Single rung"
+    ))
+
+    rows.append((
+        "Video Ladder",
+        "Duplicate Rungs",
+        str(sum(analysis["duplicate"]))
+    ))
+
+    rows.append((
+        "Video Ladder",
+        "Inverted Rungs",
+        str(sum(analysis["inverted"]))
+    ))
+
+    return rows
@@ -0,0 +1,224 @@
+# fetcher.py
+import gzip
+import http.client
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from urllib.parse import urljoin, urlsplit
+
+# Maximum number of connections open at the same time (across all hosts)
+MAX_CONNECTIONS = 8
+
+# Socket timeout in seconds for connecting and reading
+TIMEOUT = 30
+
+# Redirects followed before a fetch is reported as failed
+MAX_REDIRECTS = 5
+
+USER_AGENT = "MPD_Analyser"
+
+# Errors raised when a kept-alive connection was closed by the server in the meantime
+STALE_CONNECTION_ERRORS = (
+    http.client.RemoteDisconnected,
+    http.client.BadStatusLine,
+    BrokenPipeError,
+    ConnectionResetError,
+)
+
+
+# Returns True if `source` is an http(s) URL rather than a local path
+def is_url(source):
+    return str(source).lower().startswith(("http://", "https://"))
+
+
+# Bounded pool of keep-alive HTTP connections
+# At most `max_connections` connections are in use at once; idle connections are kept
+# per (scheme, host, port) and reused by later requests to the same server
+class ConnectionPool:
+    def __init__(self, max_connections=MAX_CONNECTIONS, timeout=TIMEOUT):
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(max_connections)
+        self._idle = {}
+        self._lock = threading.Lock()
+
+    # Takes a connection slot and returns (key, connection, reused)
+    # With `fresh`, idle connections are skipped and a new connection is always opened
+    def acquire(self, scheme, netloc, fresh=False):
+        self._slots.acquire()
+        key = (scheme, netloc)
+
+        if not fresh:
+            with self._lock:
+                idle = self._idle.get(key)
+                if idle:
+                    return key, idle.pop(), True
+
+        if scheme == "https":
+            conn = http.client.HTTPSConnection(netloc, timeout=self.timeout)
+        else:
+            conn = http.client.HTTPConnection(netloc, timeout=self.timeout)
+        return key, conn, False
+
+    # Returns a connection to the pool (or closes it) and frees its slot
+    def release(self, key, conn, reusable):
+        if reusable:
+            with self._lock:
+                self._idle.setdefault(key, []).append(conn)
+        else:
+            conn.close()
+        self._slots.release()
+
+    # Closes every idle connection
+    def close(self):
+        with self._lock:
+            for conns in self._idle.values():
+                for conn in conns:
+                    conn.close()
+            self._idle.clear()
+
+
+# Sends one GET request over a pooled connection and returns (status, headers, body, elapsed)
+# `elapsed` excludes the time spent waiting for a free connection slot
+# A reused connection that turns out to be closed is retried once on a fresh connection
+def _request(pool, url, headers):
+    parts = urlsplit(url)
+    path = parts.path or "/"
+    if parts.query:
+        path += "?" + parts.query
+
+    for attempt in range(2):
+        # The retry skips idle connections: they may have been closed by the server too
+        key, conn, reused = pool.acquire(parts.scheme.lower(), parts.netloc, fresh=attempt > 0)
+        start = time.perf_counter()
+        try:
+            conn.request("GET", path, headers=headers)
+            response = conn.getresponse()
+            body = response.read()
+        except STALE_CONNECTION_ERRORS:
+            pool.release(key, conn, False)
+            if reused and attempt == 0:
+                continue
+            raise
+        except Exception:
+            pool.release(key, conn, False)
+            raise
+
+        pool.release(key, conn, not response.will_close)
+        return response.status, response.headers, body, time.perf_counter() - start
+
+
+# Fetches one MPD, sending If-None-Match / If-Modified-Since from `validators`
+# (a dict with optional "etag" and "last_modified" from a previous fetch)
+# Returns a dict:
+#   url           - the requested URL
+#   status        - final HTTP status (None if the request failed)
+#   data          - MPD bytes (None when not modified or failed), gzip already decoded
+#   etag          - ETag of the response (or the previous one on 304)
+#   last_modified - Last-Modified of the response (or the previous one on 304)
+#   not_modified  - True if the server answered 304 Not Modified
+#   error         - error message, or None
+#   elapsed       - seconds spent on the request(s) and gzip decoding, excluding the wait
+#                   for a free connection
+def fetch_mpd(pool, url, validators=None):
+    validators = validators or {}
+    result = {
+        "url": url,
+        "status": None,
+        "data": None,
+        "etag": validators.get("etag"),
+        "last_modified": validators.get("last_modified"),
+        "not_modified": False,
+        "error": None,
+        "elapsed": 0.0,
+    }
+
+    headers = {
+        "Accept-Encoding": "gzip",
+        "User-Agent": USER_AGENT,
+    }
+    if validators.get("etag"):
+        headers["If-None-Match"] = validators["etag"]
+    if validators.get("last_modified"):
+        headers["If-Modified-Since"] = validators["last_modified"]
+
+    target = url
+    try:
+        for _ in range(MAX_REDIRECTS + 1):
+            status, response_headers, body, elapsed = _request(pool, target, headers)
+            result["elapsed"] += elapsed
+
+            if status in (301, 302, 303, 307, 308) and response_headers.get("Location"):
+                target = urljoin(target, response_headers["Location"])
+                continue
+            break
+        else:
+            result["error"] = f"Too many redirects ({MAX_REDIRECTS})"
+            return result
+    except (OSError, http.client.HTTPException) as e:
+        result["error"] = f"{type(e).__name__}: {e}"
+        return result
+
+    result["status"] = status
+
+    if status == 304:
+        result["not_modified"] = True
+        return result
+
+    if status != 200:
+        result["error"] = f"HTTP {status}"
+        return result
+
+    if response_headers.get("Content-Encoding", "").lower() == "gzip":
+        start = time.perf_counter()
+        try:
+            body = gzip.decompress(body)
+        except (OSError, EOFError) as e:
+            result["error"] = f"Invalid gzip body: {e}"
+            return result
+        finally:
+            result["elapsed"] += time.perf_counter() - start
+
+    result["data"] = body
+    result["etag"] = response_headers.get("ETag")
+    result["last_modified"] = response_headers.get("Last-Modified")
+    return result
+
+
+# Fetches many MPDs concurrently over one bounded connection pool and yields each
+# fetch_mpd result as soon as it completes (not in the order of `urls`)
+# `validators` maps URL -> validators dict (see fetch_mpd) for conditional requests
+# At most 2 × max_connections fetches are in flight, so only that many bodies are held
+# in memory at once however many URLs are given; consume each result before the next
+def iter_fetch(urls, validators=None, max_connections=MAX_CONNECTIONS, timeout=TIMEOUT):
+    validators = validators or {}
+    pool = ConnectionPool(max_connections, timeout)
+    pending_urls = iter(urls)
+    in_flight = set()
+
+    try:
+        with ThreadPoolExecutor(max_workers=max_connections) as executor:
+            while True:
+                # Keep the queue topped up without submitting the whole list at once
+                for url in pending_urls:
+                    in_flight.add(executor.submit(fetch_mpd, pool, url, validators.get(url)))
+                    if len(in_flight) >= 2 * max_connections:
+                        break
+
+                if not in_flight:
+                    return
+
+                done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+    finally:
+        pool.close()
+
+
+# Fetches many MPDs concurrently and returns the fetch_mpd results in the order of `urls`
+# Every body is held in memory until the call returns; prefer iter_fetch for large batches
+def fetch_all(urls, validators=None, max_connections=MAX_CONNECTIONS, timeout=TIMEOUT):
+    results = {
+        result["url"]: result
+        for result in iter_fetch(urls, validators, max_connections, timeout)
+    }
+    return [results[url] for url in urls]
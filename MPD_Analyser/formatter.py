@@ -27,3 +27,54 @@ def format_period_timeline(timeline):
         lines.append("")
 
     return "\n".join(lines)
+
+
+# Formats an optional byte count in KiB ("n/a" when memory was not traced)
+def _kib(value):
+    return f"{value / 1024:.1f}" if value is not None else "n/a"
+
+
+# Formats the profiler stages of one run as a markdown-style timing table
+# showing wall time, share of the run, elements scanned and peak memory per stage
+# `cached` notes that the MPD was already in the catalog, so only formatting was timed
+def format_profile(stages, cached=False):
+    lines = ["", "===== PROFILE =====", ""]
+
+    if cached:
+        lines.append("MPD unchanged in catalog: parsing and extractors were skipped")
+        lines.append("")
+
+    total = sum(s["wall"] for s in stages)
+    lines.append("| Stage                          | Wall (ms) | Share  | Elements | Peak (KiB) |")
+    lines.append("|--------------------------------|----------:|-------:|---------:|-----------:|")
+
+    for s in stages:
+        share = s["wall"] / total * 100 if total else 0.0
+        elements = s["elements"] if s["elements"] is not None else "-"
+        lines.append(
+            f"| {s['stage']:<30} | {s['wall'] * 1000:>9.2f} | {share:>5.1f}% "
+            f"| {elements:>8} | {_kib(s['peak']):>10} |"
+        )
+
+    lines.append(f"| {'Total':<30} | {total * 1000:>9.2f} | 100.0% |          |            |")
+    lines.append("")
+    return "\n".join(lines)
+
+
+# Formats stage totals aggregated across a batch of runs (see Profiler.totals)
+# Stages are listed slowest first so the dominant stage is at the top
+def format_profile_summary(totals, run_count):
+    lines = ["", f"===== PROFILE SUMMARY ({run_count} files) =====", ""]
+    lines.append("| Stage                          | Runs | Total (ms) | Mean (ms) | Max (ms) | Elements | Max Peak (KiB) |")
+    lines.append("|--------------------------------|-----:|-----------:|----------:|---------:|---------:|---------------:|")
+
+    for t in totals:
+        elements = t["elements"] if t["elements"] is not None else "-"
+        lines.append(
+            f"| {t['stage']:<30} | {t['runs']:>4} | {t['wall'] * 1000:>10.2f} "
+            f"| {t['wall'] / t['runs'] * 1000:>9.2f} | {t['max_wall'] * 1000:>8.2f} "
+            f"| {elements:>8} | {_kib(t['peak']):>14} |"
+        )
+
+    lines.append("")
+    return "\n".join(lines)
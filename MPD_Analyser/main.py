@@ -1,38 +1,114 @@
 # main.py
-from pathlib import Path
-from mpd_parser import load_mpd
-from extract_general import extract_general_capabilities
-from extract_periods import extract_period_timeline
-from formatter import format_table, format_period_timeline
-from extract_video import extract_video_capabilities
-from extract_audio import extract_audio_capabilities
-from extract_subtitles import extract_subtitle_capabilities
-from extract_drm import extract_drm_capabilities
+import argparse
+
+from catalog import (
+    CATALOG_PATH, INGEST_ERRORS, open_catalog, ingest_file, ingest_fetched, fetch_sources,
+    format_report,
+)
+from fetcher import MAX_CONNECTIONS, is_url
+from formatter import format_profile, format_profile_summary
+from profiler import Profiler, profiled
+from utils import positive_int
 
 
 MPD_PATH = "/Users/jr/Downloads/house0fdragonss1e2dash.mpd"
 OUTPUT_FILE = "mpd_capabilities.txt"
 
+
+# Ingests one MPD through `ingest` (returning (mpd_id, new)) and renders its report section
+# With a profiler, the section ends with the stage table of this MPD's run
+def render_section(conn, path, ingest, profiler, labelled):
+    if profiler:
+        profiler.begin(path)
+
+    output = []
+
+    # Label each report when several MPDs are analysed in one run
+    if labelled:
+        output.append(f"===== {path} =====\n")
+
+    try:
+        mpd_id, new = ingest()
+    except INGEST_ERRORS as e:
+        output.append(f"Could not analyse {path}: {e}\n")
+        return "\n".join(output)
+
+    output.append(profiled(profiler, "format_report", format_report, conn, mpd_id))
+
+    if profiler:
+        output.append(format_profile(profiler.runs[-1]["stages"], cached=not new))
+
+    return "\n".join(output)
+
+
 def main():
-    root, ns = load_mpd(MPD_PATH)
+    parser = argparse.ArgumentParser(description="Analyse DASH MPD capabilities")
+    parser.add_argument("paths", nargs="*", default=[MPD_PATH],
+                        help="MPD files or http(s) URLs to analyse")
+    parser.add_argument("--output", default=OUTPUT_FILE, help="Report file")
+    parser.add_argument("--catalog", default=CATALOG_PATH, help="SQLite catalog path")
+    parser.add_argument("--max-connections", type=positive_int, default=MAX_CONNECTIONS,
+                        help="Concurrent HTTP connections used to fetch URLs")
+    parser.add_argument("--reingest", action="store_true",
+                        help="Re-analyse MPDs even if they are already catalogued")
+    parser.add_argument("--profile", action="store_true",
+                        help="Add per-stage timing to the report")
+    parser.add_argument("--trace-memory", action="store_true",
+                        help="With --profile, also record tracemalloc peak memory per stage")
+    args = parser.parse_args()
 
-    rows = []
-    rows.extend(extract_general_capabilities(root, ns))
-    rows.extend(extract_video_capabilities(root, ns))
-    rows.extend(extract_audio_capabilities(root, ns))
-    rows.extend(extract_subtitle_capabilities(root, ns))
-    rows.extend(extract_drm_capabilities(root, ns))
+    profiler = Profiler(trace_memory=args.trace_memory) if args.profile else None
 
-    timeline = extract_period_timeline(root, ns)
+    # Every MPD is ingested into the catalog (unchanged files are not re-parsed)
+    # and its report is rendered from the catalog
+    conn = open_catalog(args.catalog)
 
-    output = []
-    output.append(format_table(rows))
-    output.append(format_period_timeline(timeline))
+    # Rendered sections by position in args.paths, so the report keeps the argument order
+    # even though URLs are ingested in the order their fetches complete
+    sections = [None] * len(args.paths)
+    url_positions = {}
+
+    for i, path in enumerate(args.paths):
+        if is_url(path):
+            url_positions.setdefault(path, []).append(i)
+        else:
+            sections[i] = render_section(
+                conn, path, lambda: ingest_file(conn, path, profiler, args.reingest),
+                profiler, len(args.paths) > 1,
+            )
+
+    # URLs are fetched concurrently (unchanged manifests come back as 304) and each one is
+    # ingested as soon as it arrives, so only the fetches in flight are held in memory
+    for result in fetch_sources(conn, list(url_positions), args.max_connections, args.reingest):
+        url = result["url"]
+        outcome = []
+
+        # A URL given several times is fetched and ingested once; later copies reuse it
+        def ingest():
+            if not outcome:
+                try:
+                    outcome.append(ingest_fetched(conn, result, profiler, args.reingest))
+                except INGEST_ERRORS as e:
+                    outcome.append(e)
+                    raise
+                return outcome[0]
+            if isinstance(outcome[0], Exception):
+                raise outcome[0]
+            return outcome[0][0], False
+
+        for i in url_positions[url]:
+            sections[i] = render_section(conn, url, ingest, profiler, len(args.paths) > 1)
+
+    output = list(sections)
+
+    # Batch runs also get the stage totals across all files
+    if profiler and len(args.paths) > 1:
+        output.append(format_profile_summary(profiler.totals(), len(profiler.runs)))
 
-    with open(OUTPUT_FILE, "w", encoding="utf-8") as f:
+    with open(args.output, "w", encoding="utf-8") as f:
         f.write("\n".join(output))
 
-    print(f"Report written to {OUTPUT_FILE}")
+    print(f"Report written to {args.output}")
 
 if __name__ == "__main__":
     main()
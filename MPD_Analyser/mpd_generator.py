@@ -0,0 +1,178 @@
+# mpd_generator.py
+import random
+import xml.etree.ElementTree as ET
+
+from mpd_parser import ns
+
+# Namespace used for cenc:default_KID on ContentProtection elements
+CENC_NS = "urn:mpeg:cenc:2013"
+
+# Register namespaces so the generated XML uses the same prefixes as real MPDs
+ET.register_namespace("", ns["dash"])
+ET.register_namespace("cenc", CENC_NS)
+
+# Representative video ladder rungs: (width, height, bandwidth in bps)
+VIDEO_LADDER = [
+    (416, 234, 160000),
+    (640, 360, 450000),
+    (768, 432, 900000),
+    (960, 540, 1600000),
+    (1280, 720, 3000000),
+    (1920, 1080, 6000000),
+    (2560, 1440, 10000000),
+    (3840, 2160, 16000000),
+]
+
+# Codecs cycled across generated AdaptationSets of each type
+VIDEO_CODECS = ["avc1.640028", "hvc1.2.4.L123.90"]
+AUDIO_CODECS = ["mp4a.40.2", "ec-3"]
+AUDIO_BITRATES = [64000, 128000, 256000, 384000, 640000]
+LANGUAGES = ["en-US", "es-419", "fr-FR", "de-DE", "it-IT", "pt-BR", "ja", "ko"]
+
+# DRM systems attached to protected AdaptationSets (Widevine + PlayReady)
+DRM_SCHEMES = [
+    "urn:uuid:edef8ba9-79d6-4ace-a3c8-27dcd51d21ed",
+    "urn:uuid:9a04f079-9840-4286-ab92-e65be0885f95",
+]
+
+# Length of one synthetic period in seconds, and segment duration in timescale units
+PERIOD_SECONDS = 600
+SEGMENT_TIMESCALE = 1000
+SEGMENT_DURATION = 2000
+
+
+# Formats a number of seconds as an ISO 8601 duration understood by utils.parse_iso_duration
+def _iso_duration(seconds):
+    h, rem = divmod(int(seconds), 3600)
+    m, s = divmod(rem, 60)
+    return f"PT{h}H{m}M{s}S"
+
+
+# Appends a SegmentTemplate with a SegmentTimeline of the requested number of <S> entries
+# Entries alternate between explicit segments and repeat runs to mimic packager output
+def _add_segment_timeline(parent, timeline_length):
+    template = ET.SubElement(parent, f"{{{ns['dash']}}}SegmentTemplate", {
+        "timescale": str(SEGMENT_TIMESCALE),
+        "initialization": "$RepresentationID$/init.mp4",
+        "media": "$RepresentationID$/$Time$.m4s",
+    })
+    timeline = ET.SubElement(template, f"{{{ns['dash']}}}SegmentTimeline")
+
+    for i in range(timeline_length):
+        attrs = {"d": str(SEGMENT_DURATION)}
+        if i == 0:
+            attrs["t"] = "0"
+        if i % 2:
+            attrs["r"] = "1"
+        ET.SubElement(timeline, f"{{{ns['dash']}}}S", attrs)
+
+
+# Appends ContentProtection elements (mp4protection + one per DRM system) to an AdaptationSet
+def _add_content_protection(aset, kid):
+    ET.SubElement(aset, f"{{{ns['dash']}}}ContentProtection", {
+        "schemeIdUri": "urn:mpeg:dash:mp4protection:2011",
+        "value": "cenc",
+        f"{{{CENC_NS}}}default_KID": kid,
+    })
+    for scheme in DRM_SCHEMES:
+        ET.SubElement(aset, f"{{{ns['dash']}}}ContentProtection", {
+            "schemeIdUri": scheme,
+        })
+
+
+# Builds one AdaptationSet of the given content type with `representations` Representations
+def _add_adaptation_set(period, set_id, content_type, representations, protected, timeline_length, rng):
+    lang = LANGUAGES[set_id % len(LANGUAGES)]
+    attrs = {"id": str(set_id), "contentType": content_type}
+
+    if content_type == "video":
+        attrs["mimeType"] = "video/mp4"
+        attrs["frameRate"] = "30000/1001"
+    elif content_type == "audio":
+        attrs["mimeType"] = "audio/mp4"
+        attrs["lang"] = lang
+    else:
+        attrs["mimeType"] = "application/ttml+xml"
+        attrs["lang"] = lang
+
+    aset = ET.SubElement(period, f"{{{ns['dash']}}}AdaptationSet", attrs)
+
+    if protected:
+        _add_content_protection(aset, f"{rng.getrandbits(128):032x}")
+
+    if content_type == "text" and set_id % 3 == 0:
+        ET.SubElement(aset, f"{{{ns['dash']}}}Role", {
+            "schemeIdUri": "urn:mpeg:dash:role:2011",
+            "value": "forced",
+        })
+
+    _add_segment_timeline(aset, timeline_length)
+
+    for r in range(representations):
+        rep_attrs = {"id": f"{content_type}-{set_id}-{r}"}
+        if content_type == "video":
+            width, height, bandwidth = VIDEO_LADDER[r % len(VIDEO_LADDER)]
+            rep_attrs.update({
+                "codecs": VIDEO_CODECS[set_id % len(VIDEO_CODECS)],
+                "width": str(width),
+                "height": str(height),
+                "bandwidth": str(bandwidth + r // len(VIDEO_LADDER)),
+            })
+        elif content_type == "audio":
+            rep_attrs.update({
+                "codecs": AUDIO_CODECS[set_id % len(AUDIO_CODECS)],
+                "bandwidth": str(AUDIO_BITRATES[r % len(AUDIO_BITRATES)]),
+            })
+        else:
+            rep_attrs.update({"codecs": "stpp", "bandwidth": "1000"})
+        ET.SubElement(aset, f"{{{ns['dash']}}}Representation", rep_attrs)
+
+
+# Generates a synthetic MPD and returns it as UTF-8 encoded XML bytes
+#   periods                     - number of <Period> elements
+#   adaptation_sets_per_period  - AdaptationSets per period (cycled video / audio / text)
+#   representations             - Representations per AdaptationSet
+#   protection_density          - fraction (0.0 - 1.0) of AdaptationSets carrying ContentProtection
+#   timeline_length             - number of <S> entries in each SegmentTimeline
+#   seed                        - random seed so the same arguments always produce the same MPD
+def generate_mpd(periods=1, adaptation_sets_per_period=3, representations=4,
+                 protection_density=1.0, timeline_length=10, seed=0):
+    rng = random.Random(seed)
+
+    root = ET.Element(f"{{{ns['dash']}}}MPD", {
+        "type": "static",
+        "profiles": "urn:mpeg:dash:profile:isoff-live:2011",
+        "minBufferTime": "PT2S",
+        "mediaPresentationDuration": _iso_duration(periods * PERIOD_SECONDS),
+    })
+
+    content_types = ["video", "audio", "text"]
+    set_id = 0
+
+    for p in range(periods):
+        period = ET.SubElement(root, f"{{{ns['dash']}}}Period", {
+            "id": str(p),
+            "start": _iso_duration(p * PERIOD_SECONDS),
+            "duration": _iso_duration(PERIOD_SECONDS),
+        })
+
+        for a in range(adaptation_sets_per_period):
+            protected = rng.random() < protection_density
+            _add_adaptation_set(
+                period,
+                set_id,
+                content_types[a % len(content_types)],
+                representations,
+                protected,
+                timeline_length,
+                rng,
+            )
+            set_id += 1
+
+    return ET.tostring(root, encoding="utf-8", xml_declaration=True)
+
+
+# Generates a synthetic MPD and writes it to `path`
+def write_mpd(path, **kwargs):
+    with open(path, "wb") as f:
+        f.write(generate_mpd(**kwargs))
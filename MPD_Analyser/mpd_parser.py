@@ -1,13 +1,27 @@
 # mpd_parser.py
 import xml.etree.ElementTree as ET
 
+from fetcher import ConnectionPool, fetch_mpd, is_url
+
 # DASH namespace definition for XML parsing
 # This namespace is used to query DASH-specific elements in the MPD XML
 ns = {"dash": "urn:mpeg:dash:schema:mpd:2011"}
 
 # Loads and parses an MPD (Media Presentation Description) XML file
+# `path` may also be an http(s) URL or a file object
 # Returns the root element and namespace dictionary for XPath queries
 def load_mpd(path):
+    # Fetch remote MPDs into memory and parse the bytes directly (no temporary file)
+    if isinstance(path, str) and is_url(path):
+        pool = ConnectionPool(max_connections=1)
+        try:
+            result = fetch_mpd(pool, path)
+        finally:
+            pool.close()
+        if result["error"]:
+            raise OSError(f"Could not fetch {path}: {result['error']}")
+        return load_mpd_bytes(result["data"])
+
     # Parse the XML file
     tree = ET.parse(path)
     
@@ -15,4 +29,11 @@ def load_mpd(path):
     root = tree.getroot()
     
     # Return both root element and namespace for use in XPath queries
-    return root, ns
\ No newline at end of file
+    return root, ns
+
+
+# Parses an MPD already held in memory (e.g. fetched over HTTP)
+# Returns the root element and namespace dictionary, like load_mpd
+def load_mpd_bytes(data):
+    root = ET.fromstring(data)
+    return root, ns
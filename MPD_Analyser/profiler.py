@@ -0,0 +1,190 @@
+# profiler.py
+import time
+import tracemalloc
+
+
+# Returns the number of elements ElementTree examines to answer `path` from `element`
+# A "//" search scans the whole subtree; a child path ("dash:Period/dash:AdaptationSet")
+# examines every child of the elements reached at each step. find() is counted like
+# findall() (it can stop at the first match, so for it this is an upper bound).
+def _scanned(element, path, namespaces):
+    if "//" in path:
+        return sum(1 for _ in element.iter()) - 1
+
+    scanned = 0
+    frontier = [element]
+    for step in path.split("/"):
+        if step in ("", "."):
+            continue
+        scanned += sum(len(e) for e in frontier)
+        frontier = [child for e in frontier for child in e.findall(step, namespaces)]
+    return scanned
+
+
+# Wraps an Element and counts every element that find / findall / iter scan
+# Extractors only navigate the tree through these calls, so the count is the number of
+# elements an extractor made ElementTree examine: a ".//" search over the whole MPD costs
+# the size of the tree even when it returns a handful of elements. Returned elements are
+# wrapped too, so nested queries are counted. The wrapper is only used in profile mode.
+class _CountingElement:
+    __slots__ = ("_element", "_counter")
+
+    def __init__(self, element, counter):
+        self._element = element
+        self._counter = counter
+
+    def _wrap(self, elements, scanned):
+        self._counter[0] += scanned
+        return [_CountingElement(e, self._counter) for e in elements]
+
+    def findall(self, path, namespaces=None):
+        return self._wrap(
+            self._element.findall(path, namespaces),
+            _scanned(self._element, path, namespaces),
+        )
+
+    def find(self, path, namespaces=None):
+        found = self._element.find(path, namespaces)
+        scanned = _scanned(self._element, path, namespaces)
+        wrapped = self._wrap([] if found is None else [found], scanned)
+        return wrapped[0] if wrapped else None
+
+    def iter(self, tag=None):
+        scanned = sum(1 for _ in self._element.iter())
+        return iter(self._wrap(list(self._element.iter(tag)), scanned))
+
+    def __iter__(self):
+        return iter(self._wrap(list(self._element), len(self._element)))
+
+    def __len__(self):
+        return len(self._element)
+
+    # Everything else (attrib, tag, text, get, ...) is read from the wrapped element
+    def __getattr__(self, name):
+        return getattr(self._element, name)
+
+
+# Counts the elements of a parsed MPD; used as the element count of the load_mpd stage
+def count_parsed_elements(result):
+    root, _ = result
+    return sum(1 for _ in root.iter())
+
+
+# Runs func(*args) under tracemalloc and returns the peak memory it allocated, in bytes
+# Only allocations made by this call count towards the peak
+def _traced_peak(func, *args):
+    was_tracing = tracemalloc.is_tracing()
+    if was_tracing:
+        tracemalloc.reset_peak()
+    else:
+        tracemalloc.start()
+    baseline, _ = tracemalloc.get_traced_memory()
+
+    try:
+        func(*args)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        if not was_tracing:
+            tracemalloc.stop()
+
+    return peak - baseline
+
+
+# Records per-stage wall time, elements scanned and (optionally) tracemalloc peak memory
+# Stages are grouped by run, one run per analysed MPD (see begin)
+class Profiler:
+    def __init__(self, trace_memory=False):
+        self.trace_memory = trace_memory
+        self.runs = []      # one {"label", "stages"} dict per run, stages in execution order
+        self.label = None   # label of the current run
+
+    # Starts a new run (e.g. one MPD file); later stages are recorded in it
+    # Runs are kept in order, so the same label appearing twice in a batch gives two runs
+    def begin(self, label):
+        self.label = label
+        self.runs.append({"label": label, "stages": []})
+
+    # Calls func(*args) and records it as `stage` of the current run
+    # `count` receives the result and returns the number of elements scanned (or None)
+    # Wall time always comes from an untraced call: tracemalloc slows stages down unevenly,
+    # which would change which stage looks dominant. With trace_memory, the peak is taken
+    # from a second, traced call. Stages with side effects (e.g. catalog writes) pass
+    # repeatable=False: they run once, untraced, and report no peak.
+    def measure(self, stage, func, *args, count=None, repeatable=True):
+        if self.label is None:
+            self.begin("run")
+
+        start = time.perf_counter()
+        result = func(*args)
+        wall = time.perf_counter() - start
+
+        # Count before any traced re-run, which would visit the same elements again
+        elements = count(result) if count else None
+
+        peak = None
+        if self.trace_memory and repeatable:
+            peak = _traced_peak(func, *args)
+
+        self.record(stage, wall, elements, peak)
+        return result
+
+    # Records a stage measured elsewhere (e.g. a fetch timed on a worker thread)
+    def record(self, stage, wall, elements=None, peak=None):
+        if self.label is None:
+            self.begin("run")
+
+        self.runs[-1]["stages"].append({
+            "stage": stage,
+            "wall": wall,
+            "elements": elements,
+            "peak": peak,
+        })
+
+    # Calls an extractor taking (root, ns) and counts the elements its queries scan
+    def measure_extractor(self, func, root, ns, stage=None):
+        counter = [0]
+        return self.measure(
+            stage or func.__name__,
+            func,
+            _CountingElement(root, counter),
+            ns,
+            count=lambda _: counter[0],
+        )
+
+    # Aggregates every run into one entry per stage, slowest total first
+    # Each entry: stage, runs, total wall, max wall, total elements, max peak
+    def totals(self):
+        totals = {}
+        for run in self.runs:
+            for s in run["stages"]:
+                entry = totals.setdefault(s["stage"], {
+                    "stage": s["stage"],
+                    "runs": 0,
+                    "wall": 0.0,
+                    "max_wall": 0.0,
+                    "elements": None,
+                    "peak": None,
+                })
+                entry["runs"] += 1
+                entry["wall"] += s["wall"]
+                entry["max_wall"] = max(entry["max_wall"], s["wall"])
+                if s["elements"] is not None:
+                    entry["elements"] = (entry["elements"] or 0) + s["elements"]
+                if s["peak"] is not None:
+                    entry["peak"] = max(entry["peak"] or 0, s["peak"])
+
+        return sorted(totals.values(), key=lambda e: e["wall"], reverse=True)
+
+
+# Library hook: runs func(*args) through the profiler when one is given, directly otherwise
+def profiled(profiler, stage, func, *args, count=None, repeatable=True):
+    if profiler is None:
+        return func(*args)
+    return profiler.measure(stage, func, *args, count=count, repeatable=repeatable)
+
+
+# Library hook for extractors taking (root, ns); counts scanned elements when profiling
+def profiled_extractor(profiler, func, root, ns, stage=None):
+    if profiler is None:
+        return func(root, ns)
+    return profiler.measure_extractor(func, root, ns, stage)
@@ -0,0 +1,163 @@
+# test_fetcher.py
+# Repeatable checks of the HTTP fetcher and URL ingestion against a local http.server
+# Run with: python -m unittest test_fetcher   (or python -m pytest test_fetcher.py)
+import gzip
+import hashlib
+import http.server
+import threading
+import unittest
+from unittest import mock
+
+import catalog
+from catalog import fetch_sources, ingest_fetched, open_catalog
+from fetcher import ConnectionPool, fetch_all, fetch_mpd
+from mpd_generator import generate_mpd
+
+
+MPD_BYTES = generate_mpd()
+ETAG = '"%s"' % hashlib.sha256(MPD_BYTES).hexdigest()
+
+
+# Serves MPD_BYTES (gzip, with an ETag) at /title.mpd, a 302 at /redirect and 404 elsewhere
+# Every request is logged as (path, client port, If-None-Match) to check reuse and validators
+class MPDHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, status, headers=(), body=b""):
+        self.send_response(status)
+        for name, value in headers:
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        self.server.requests.append(
+            (self.path, self.client_address[1], self.headers.get("If-None-Match"))
+        )
+
+        if self.path == "/redirect":
+            self._send(302, [("Location", "/title.mpd")])
+        elif self.path != "/title.mpd":
+            self._send(404)
+        elif self.headers.get("If-None-Match") == ETAG:
+            self._send(304, [("ETag", ETAG)])
+        elif "gzip" in self.headers.get("Accept-Encoding", ""):
+            self._send(200, [("ETag", ETAG), ("Content-Encoding", "gzip")], gzip.compress(MPD_BYTES))
+        else:
+            self._send(200, [("ETag", ETAG)], MPD_BYTES)
+
+        # Simulates a keep-alive timeout: the server drops the connection without saying so
+        if self.server.drop_connections:
+            self.close_connection = True
+
+
+class FetcherTest(unittest.TestCase):
+    def setUp(self):
+        self.server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), MPDHandler)
+        self.server.requests = []
+        self.server.drop_connections = False
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.base = f"http://127.0.0.1:{self.server.server_port}"
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_200_with_gzip(self):
+        pool = ConnectionPool()
+        result = fetch_mpd(pool, self.base + "/title.mpd")
+        pool.close()
+
+        self.assertEqual(result["status"], 200)
+        self.assertIsNone(result["error"])
+        self.assertEqual(result["data"], MPD_BYTES)
+        self.assertEqual(result["etag"], ETAG)
+
+    def test_304_with_etag(self):
+        pool = ConnectionPool()
+        result = fetch_mpd(pool, self.base + "/title.mpd", {"etag": ETAG})
+        pool.close()
+
+        self.assertTrue(result["not_modified"])
+        self.assertIsNone(result["data"])
+        self.assertEqual(result["etag"], ETAG)
+        self.assertEqual(self.server.requests[-1][2], ETAG)
+
+    def test_redirect(self):
+        pool = ConnectionPool()
+        result = fetch_mpd(pool, self.base + "/redirect")
+        pool.close()
+
+        self.assertEqual(result["status"], 200)
+        self.assertEqual(result["data"], MPD_BYTES)
+        self.assertEqual([r[0] for r in self.server.requests], ["/redirect", "/title.mpd"])
+
+    def test_404(self):
+        pool = ConnectionPool()
+        result = fetch_mpd(pool, self.base + "/missing.mpd")
+        pool.close()
+
+        self.assertEqual(result["error"], "HTTP 404")
+        self.assertIsNone(result["data"])
+
+    def test_connection_reuse(self):
+        urls = [self.base + "/title.mpd"] * 5
+        results = fetch_all(urls, max_connections=1)
+
+        self.assertTrue(all(r["data"] == MPD_BYTES for r in results))
+        self.assertEqual(len({port for _, port, _ in self.server.requests}), 1)
+
+    # Several idle connections closed by the server: the retry must open a new connection
+    # rather than take the next (equally stale) idle one
+    def test_stale_connections_retried_on_new_connection(self):
+        self.server.drop_connections = True
+        pool = ConnectionPool(max_connections=3)
+        barrier = threading.Barrier(3)
+
+        # Three concurrent fetches leave three idle connections, all closed by the server
+        def fetch():
+            barrier.wait()
+            return fetch_mpd(pool, self.base + "/title.mpd")
+
+        threads = [threading.Thread(target=fetch) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        result = fetch_mpd(pool, self.base + "/title.mpd")
+        pool.close()
+
+        self.assertIsNone(result["error"])
+        self.assertEqual(result["data"], MPD_BYTES)
+
+    # A URL is fetched conditionally once catalogued, unless its analysis is outdated
+    def test_ingest_revalidates_only_current_analyses(self):
+        conn = open_catalog(":memory:")
+        url = self.base + "/title.mpd"
+
+        def ingest():
+            (result,) = fetch_sources(conn, [url])
+            return ingest_fetched(conn, result)
+
+        mpd_id, new = ingest()
+        self.assertTrue(new)
+
+        self.assertEqual(ingest(), (mpd_id, False))
+        self.assertEqual(self.server.requests[-1][2], ETAG)
+
+        with mock.patch.object(catalog, "ANALYSER_VERSION", catalog.ANALYSER_VERSION + 1):
+            self.assertEqual(ingest(), (mpd_id, True))
+            self.assertIsNone(self.server.requests[-1][2])
+            version = conn.execute(
+                "SELECT analyser_version FROM mpds WHERE id = ?", (mpd_id,)
+            ).fetchone()[0]
+            self.assertEqual(version, catalog.ANALYSER_VERSION)
+
+
+if __name__ == "__main__":
+    unittest.main()
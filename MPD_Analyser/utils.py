@@ -1,4 +1,5 @@
 # utils.py
+import argparse
 import re
 from datetime import timedelta
 
@@ -40,3 +41,67 @@ def format_timedelta(td):
     if h:
         return f"{h}h {m:02d}m {s:02d}s"
     return f"{m}m {s:02d}s"
+
+
+# Maps the sample-entry prefix of a codecs string to a codec family name
+# e.g. "avc1.640028" -> "AVC", "hvc1.2.4.L123.90" -> "HEVC", "mp4a.40.2" -> "AAC"
+CODEC_FAMILIES = {
+    "avc1": "AVC",
+    "avc3": "AVC",
+    "hvc1": "HEVC",
+    "hev1": "HEVC",
+    "dvh1": "Dolby Vision",
+    "dvhe": "Dolby Vision",
+    "av01": "AV1",
+    "vp09": "VP9",
+    "vp9": "VP9",
+    "mp4a": "AAC",
+    "ac-3": "AC-3",
+    "ec-3": "E-AC-3",
+    "ac-4": "AC-4",
+    "opus": "Opus",
+    "stpp": "TTML",
+    "wvtt": "WebVTT",
+}
+
+
+# Returns the codec family for a codecs attribute value ("Unknown" if not recognised)
+def codec_family(codec):
+    if not codec:
+        return "Unknown"
+
+    # Only the part before the first dot identifies the sample entry
+    prefix = codec.split(".", 1)[0].strip().lower()
+    return CODEC_FAMILIES.get(prefix, prefix or "Unknown")
+
+
+# Parses a DASH frameRate attribute ("25", "30000/1001") into frames per second
+# Returns 0.0 when the value is missing or malformed
+def parse_frame_rate(value):
+    if not value:
+        return 0.0
+
+    num, _, den = value.partition("/")
+    try:
+        fps = float(num) / float(den) if den else float(num)
+    except (ValueError, ZeroDivisionError):
+        return 0.0
+    return fps
+
+
+# Returns the content type of an AdaptationSet ("video", "audio", "text", ...) from its
+# attributes, falling back to the MIME type when contentType is not signalled
+def adaptation_set_content_type(attrs):
+    mime_type = attrs.get("mimeType")
+    return attrs.get("contentType") or (mime_type.split("/", 1)[0] if mime_type else None)
+
+
+# argparse type for options that must be a positive integer (e.g. --max-connections)
+def positive_int(value):
+    try:
+        number = int(value)
+    except ValueError:
+        number = 0
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be a positive integer, got {value!r}")
+    return number